@@ -10,23 +10,129 @@ Usage (example in PowerShell):
       --pages "all"
 """
 
+from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
 import math
+import operator
 import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Set, Tuple, Union
 
-import pandas as pd
-import tabula
+# pandas, numpy, pdfplumber and tabula are imported where they're used so
+# --help and argument errors don't pay their import cost.
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Force tabula to use subprocess mode (avoids JPype issues)
 os.environ["TABULA_USE_SUBPROCESS"] = "1"
 
+# Extracted tables are cached here so re-runs skip the PDF parse (and JVM start)
+TABLE_CACHE_DIR = Path(".table_cache")
+
+# Text-based detection, pdfplumber's equivalent of tabula's stream mode
+PDFPLUMBER_TABLE_SETTINGS = {
+    "vertical_strategy": "text",
+    "horizontal_strategy": "text",
+}
+
 STANDARD_NAME = "ASME B36.10M-2022"
 SOURCE_FILE_NAME = "ASME B36.10-2022.pdf"
 DEFAULT_PIPE_CATEGORY = "CS"
 
+# Total JVM heap for one run. A bigger heap with G1 avoids GC thrashing on the
+# large ASME PDFs. Parallel tabula processes split this budget between them,
+# so at most TABULA_HEAP_MB // TABULA_MIN_HEAP_MB JVMs run at once.
+TABULA_HEAP_MB = 4096
+TABULA_MIN_HEAP_MB = 512
+
+# Known table layout of the source PDF, in PDF points from the page's top-left
+# corner (as shown in the Tabula UI). "area" is [top, left, bottom, right] and
+# "columns" are the x positions of the column boundaries. With either set,
+# tabula skips its guess pass; None keeps auto-detection. --area / --columns
+# override these.
+TABLE_LAYOUTS: Dict[str, Dict[str, Optional[List[float]]]] = {
+    SOURCE_FILE_NAME: {"area": None, "columns": None},
+}
+
+# Fractional NPS designations as printed in the ASME tables. Anything else
+# must be a plain decimal ("2", "24", "0.5") to get an nps_inch value.
+NPS_FRACTIONS = {
+    "1/8": 0.125,
+    "1/4": 0.25,
+    "3/8": 0.375,
+    "1/2": 0.5,
+    "3/4": 0.75,
+    "1 1/4": 1.25,
+    "1 1/2": 1.5,
+    "2 1/2": 2.5,
+    "3 1/2": 3.5,
+}
+
+# CSV column order, matching the dicts yielded by parse_pipe_rows
+OUTPUT_FIELDS = [
+    "standard",
+    "nps_inch",
+    "dn_mm",
+    "od_inch",
+    "od_mm",
+    "schedule",
+    "wall_thickness_inch",
+    "wall_thickness_mm",
+    "weight_lb_per_ft",
+    "weight_kg_per_m",
+    "pipe_category",
+    "pressure_series",
+    "nps_display",
+    "b3610_table",
+    "b3610_page",
+    "source_file",
+    "is_active",
+]
+
+# Output rows are deduplicated on these columns; the first occurrence wins
+DEDUP_KEY = operator.itemgetter("nps_inch", "schedule", "wall_thickness_inch")
+
+# (page number, table) pairs produced by extract_tables
+PageTable = Tuple[Optional[int], "pd.DataFrame"]
+
+_RE_FLAGS = re.IGNORECASE | re.DOTALL
+
+# Header sniffing for looks_like_pipe_table
+HEADER_NPS_RE = re.compile(r"nps|nominal pipe size", _RE_FLAGS)
+HEADER_OD_RE = re.compile(r"outside|o\.d\.|od", _RE_FLAGS)
+HEADER_WALL_RE = re.compile(r"wall", _RE_FLAGS)
+
+# Header cell -> col_map key, first match wins. "(?=.*a)(?=.*b)" means the
+# cell contains both a and b, in any order.
+COLUMN_PATTERNS = [
+    (re.compile(r"nps|nominal", _RE_FLAGS), "nps"),
+    (re.compile(r"^dn", _RE_FLAGS), "dn"),
+    (re.compile(r"^(?=.*outside)(?=.*in)", _RE_FLAGS), "od_in"),
+    (re.compile(r"^(?=.*outside)(?=.*(mm|millimeter))", _RE_FLAGS), "od_mm"),
+    (re.compile(r"^(?=.*(wall|thick))(?=.*in)", _RE_FLAGS), "wall_in"),
+    (re.compile(r"^(?=.*(wall|thick))(?=.*(mm|millimeter))", _RE_FLAGS), "wall_mm"),
+    (re.compile(r"^(?=.*(weight|wt))(?=.*lb)", _RE_FLAGS), "wt_lb_ft"),
+    (re.compile(r"^(?=.*(weight|wt))(?=.*kg)", _RE_FLAGS), "wt_kg_m"),
+    (re.compile(r"sch", _RE_FLAGS), "schedule"),
+]
+
+
+def float_list(value: str) -> List[float]:
+    """
+    argparse type for comma-separated coordinates, e.g. "72,36,720,576".
+    """
+    try:
+        return [float(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got {value!r}")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Extract ASME B36.10 pipes to CSV")
@@ -43,10 +149,58 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--pages",
         default="all",
-        help='Page range for tabula, e.g. "all" or "15-40". '
+        help='Page range, e.g. "all" or "15-40". '
              "If you know the exact page range of the dimension tables, use it.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--backend",
+        choices=["pdfplumber", "tabula"],
+        default="pdfplumber",
+        help="Table extractor: pdfplumber runs in-process and records page numbers; "
+             "tabula is the old JVM-based fallback (default: pdfplumber)",
+    )
+    parser.add_argument(
+        "--area",
+        type=float_list,
+        help='Table area in PDF points as "top,left,bottom,right" '
+             "(default: TABLE_LAYOUTS entry for the PDF, else auto-detect)",
+    )
+    parser.add_argument(
+        "--columns",
+        type=float_list,
+        help='Column boundary x positions in PDF points, e.g. "80,140,210" '
+             "(default: TABLE_LAYOUTS entry for the PDF, else auto-detect)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to split the page range across "
+             "(default: CPU count, 1 disables parallel parsing)",
+    )
+    parser.add_argument(
+        "--template",
+        help="Tabula-UI template JSON (e.g. asme_b3610.tabula-template.json) listing the pages and "
+             "areas to extract. Implies --backend tabula and skips table detection; "
+             "--pages/--area/--columns are ignored",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not write the table cache in {TABLE_CACHE_DIR}/",
+    )
+    args = parser.parse_args()
+    try:
+        parse_page_spec(args.pages)
+    except ValueError as e:
+        parser.error(f"--pages: {e}")
+    if args.area is not None and len(args.area) != 4:
+        parser.error("--area needs exactly 4 values: top,left,bottom,right")
+    if args.area is not None:
+        top, left, bottom, right = args.area
+        if top >= bottom or left >= right:
+            parser.error("--area needs top < bottom and left < right")
+    return args
 
 
 def is_nan(x: Any) -> bool:
@@ -66,6 +220,22 @@ def normalise_header(cols: List[Any]) -> List[str]:
     return normed
 
 
+def is_candidate_table(df: Optional[pd.DataFrame]) -> bool:
+    """
+    Cheap shape checks run before any header text is built. A dimension table
+    needs at least 4 columns and a header row plus one data row.
+    """
+    return df is not None and not df.empty and df.shape[1] >= 4 and len(df) >= 2
+
+
+def header_text(df: pd.DataFrame) -> str:
+    """
+    Header text to sniff: the first row, which parse_pipe_rows uses as its
+    header.
+    """
+    return " ".join(normalise_header(df.iloc[0].tolist()))
+
+
 def looks_like_pipe_table(df: pd.DataFrame) -> bool:
     """
     Heuristic check if a table is a pipe dimension table.
@@ -75,17 +245,16 @@ def looks_like_pipe_table(df: pd.DataFrame) -> bool:
       - 'Outside Diameter' or 'OD'
       - 'Wall' or 'Wall Thickness'
     """
-    if df.empty or df.shape[1] < 4:
+    if not is_candidate_table(df):
         return False
 
-    header = normalise_header(df.iloc[0].tolist())
-    header_str = " ".join(h.lower() for h in header)
-
-    has_nps = "nps" in header_str or "nominal pipe size" in header_str
-    has_od = "outside" in header_str or "o.d." in header_str or "od" in header_str
-    has_wall = "wall" in header_str
+    header_str = header_text(df)
 
-    return has_nps and has_od and has_wall
+    return bool(
+        HEADER_NPS_RE.search(header_str)
+        and HEADER_OD_RE.search(header_str)
+        and HEADER_WALL_RE.search(header_str)
+    )
 
 
 def parse_schedule_from_title(title_text: str) -> str:
@@ -108,7 +277,65 @@ def pressure_series_from_schedule(schedule: str) -> str:
     return ""
 
 
-def parse_pipe_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def text_column(data: pd.DataFrame, col_map: Dict[str, Optional[int]], col_key: str) -> pd.Series:
+    """
+    Column `col_key` as stripped strings, missing where the cell is empty or unmapped.
+    """
+    import pandas as pd
+
+    col_idx = col_map[col_key]
+    if col_idx is None:
+        return pd.Series(None, index=data.index, dtype=object)
+    col = data.iloc[:, col_idx]
+    return col.astype(str).str.strip().where(col.notna())
+
+
+def float_column(text: pd.Series) -> pd.Series:
+    """
+    Vectorised float parse: drop thousands separators, non-numbers become NaN.
+    """
+    import pandas as pd
+
+    return pd.to_numeric(text.str.replace(",", "", regex=False), errors="coerce")
+
+
+def int_column(text: pd.Series) -> pd.Series:
+    """
+    Like float_column, truncated to nullable integers.
+    """
+    import numpy as np
+
+    return np.trunc(float_column(text)).astype("Int64")
+
+
+def nps_inch_column(nps: pd.Series) -> pd.Series:
+    """
+    NPS in inches: fractions like 1/8 or 1-1/2 via NPS_FRACTIONS, plain
+    decimals via to_numeric, NaN for anything else.
+    """
+    import pandas as pd
+
+    cleaned = (
+        nps.str.replace('"', "", regex=False)
+        .str.replace("\u2044", "/", regex=False)  # PDF fraction slash
+        .str.replace(r"(?<=\d)[\s-]+(?=\d/)", " ", regex=True)  # 1-1/2, 1  1/2 -> 1 1/2
+        .str.strip()
+    )
+    decimal = cleaned.where(cleaned.str.fullmatch(r"\d*\.?\d+").eq(True))
+    return cleaned.map(NPS_FRACTIONS).fillna(pd.to_numeric(decimal, errors="coerce"))
+
+
+def iter_records(out: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """
+    Yield rows as plain dicts, with None for missing values.
+    """
+    out = out.astype(object).where(out.notna(), None)
+    columns = list(out.columns)
+    for values in out.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+
+def parse_pipe_rows(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
     """
     Convert one dimension table into normalized rows for pipes_dimensions.csv.
 
@@ -120,11 +347,13 @@ def parse_pipe_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
     Because layouts vary, this function is written defensively and may need
     tweaks after you inspect your PDF.
     """
-    rows: List[Dict[str, Any]] = []
+    import pandas as pd
 
     # Use first non-empty row as header
     df = df.dropna(how="all")
     df = df.reset_index(drop=True)
+    if df.empty:
+        return
     header = normalise_header(df.iloc[0].tolist())
     data = df.iloc[1:].reset_index(drop=True)
 
@@ -142,115 +371,306 @@ def parse_pipe_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
     }
 
     for idx, col_name in enumerate(header):
-        lower = col_name.lower()
-        if "nps" in lower or "nominal" in lower:
-            col_map["nps"] = idx
-        elif lower.startswith("dn"):
-            col_map["dn"] = idx
-        elif "outside" in lower and ("in" in lower or "inch" in lower):
-            col_map["od_in"] = idx
-        elif "outside" in lower and ("mm" in lower or "millimeter" in lower):
-            col_map["od_mm"] = idx
-        elif ("wall" in lower or "thick" in lower) and ("in" in lower or "inch" in lower):
-            col_map["wall_in"] = idx
-        elif ("wall" in lower or "thick" in lower) and ("mm" in lower or "millimeter" in lower):
-            col_map["wall_mm"] = idx
-        elif ("weight" in lower or "wt" in lower) and ("lb" in lower or "lbs" in lower):
-            col_map["wt_lb_ft"] = idx
-        elif ("weight" in lower or "wt" in lower) and ("kg" in lower):
-            col_map["wt_kg_m"] = idx
-        elif "sched" in lower or "sch" in lower:
-            col_map["schedule"] = idx
-
-    for _, raw_row in data.iterrows():
-        vals = raw_row.tolist()
-
-        def get(col_key: str):
-            idx = col_map[col_key]
-            if idx is None or idx >= len(vals):
-                return None
-            val = vals[idx]
-            if is_nan(val):
-                return None
-            return str(val).strip()
-
-        nps_raw = get("nps")
-        if not nps_raw:
-            # probably not a valid line
-            continue
-
-        # Normalize numeric fields
-        def to_float(x: Any) -> float:
-            if x is None:
-                return None
-            s = str(x).replace(",", "").strip()
-            # strip trailing schedule markers etc.
-            try:
-                return float(s)
-            except ValueError:
-                return None
-
-        dn_val = get("dn")
-        dn_mm = int(float(dn_val)) if dn_val and dn_val.replace(".", "", 1).isdigit() else None
-
-        od_inch = to_float(get("od_in"))
-        od_mm = to_float(get("od_mm"))
-        wall_inch = to_float(get("wall_in"))
-        wall_mm = to_float(get("wall_mm"))
-        wt_lb_ft = to_float(get("wt_lb_ft"))
-        wt_kg_m = to_float(get("wt_kg_m"))
-        schedule = get("schedule") or ""
-
-        # Basic NPS normalisation (drop quotes)
-        nps_clean = nps_raw.replace('"', "").strip()
-        nps_display = nps_raw.strip()
-
-        try:
-            nps_inch = float(nps_clean)
-        except ValueError:
-            # For special designations like 1/8, 1/4 etc, leave as None; you can refine later.
-            nps_inch = None
-
-        row: Dict[str, Any] = {
+        for pattern, key in COLUMN_PATTERNS:
+            if pattern.search(col_name):
+                col_map[key] = idx
+                break
+
+    nps = text_column(data, col_map, "nps")
+    # rows without an NPS are probably not valid lines
+    data = data[nps.notna() & (nps != "")]
+    nps = nps.loc[data.index]
+
+    dn = text_column(data, col_map, "dn")
+    dn_mm = int_column(dn.where(dn.str.replace(".", "", n=1, regex=False).str.isdigit().eq(True)))
+    schedule = text_column(data, col_map, "schedule").fillna("")
+
+    out = pd.DataFrame(
+        {
             "standard": STANDARD_NAME,
-            "nps_inch": nps_inch,
+            "nps_inch": nps_inch_column(nps),
             "dn_mm": dn_mm,
-            "od_inch": od_inch,
-            "od_mm": od_mm,
+            "od_inch": float_column(text_column(data, col_map, "od_in")),
+            "od_mm": float_column(text_column(data, col_map, "od_mm")),
             "schedule": schedule,
-            "wall_thickness_inch": wall_inch,
-            "wall_thickness_mm": wall_mm,
-            "weight_lb_per_ft": wt_lb_ft,
-            "weight_kg_per_m": wt_kg_m,
+            "wall_thickness_inch": float_column(text_column(data, col_map, "wall_in")),
+            "wall_thickness_mm": float_column(text_column(data, col_map, "wall_mm")),
+            "weight_lb_per_ft": float_column(text_column(data, col_map, "wt_lb_ft")),
+            "weight_kg_per_m": float_column(text_column(data, col_map, "wt_kg_m")),
             "pipe_category": DEFAULT_PIPE_CATEGORY,
-            "pressure_series": pressure_series_from_schedule(schedule),
-            "nps_display": nps_display,
+            "pressure_series": schedule.map(pressure_series_from_schedule),
+            "nps_display": nps,
             # table + page will be set by caller
             "b3610_table": "",
             "b3610_page": None,
             "source_file": SOURCE_FILE_NAME,
             "is_active": True,
-        }
+        },
+        index=data.index,
+    )
 
-        rows.append(row)
+    yield from iter_records(out)
 
-    return rows
+
+def table_cache_path(
+    pdf_path: Path,
+    pages: str,
+    backend: str,
+    area: Optional[List[float]] = None,
+    columns: Optional[List[float]] = None,
+    template: Optional[Path] = None,
+) -> Path:
+    """
+    Cache file for one extraction. The PDF mtime is part of the key so
+    replacing the PDF invalidates old entries; a pinned area/columns layout
+    or template adds a short hash.
+    """
+    pages_key = pages.replace(",", "_").replace(" ", "")
+    mtime = int(pdf_path.stat().st_mtime)
+    layout_key = ""
+    if area or columns or template:
+        template_bytes = template.read_bytes() if template else b""
+        digest = hashlib.md5(repr((area, columns)).encode() + template_bytes)
+        layout_key = "_" + digest.hexdigest()[:8]
+    return TABLE_CACHE_DIR / f"{pdf_path.stem}_{backend}_{pages_key}{layout_key}_{mtime}.pkl"
+
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        return len(pdf.pages)
+
+
+def parse_page_spec(pages: str) -> Optional[List[int]]:
+    """
+    Parse a page spec ("all", "15-40", "1,3,5-7") into 1-based page numbers,
+    or None for "all". Raises ValueError for non-numbers, pages below 1 and
+    reversed ranges.
+    """
+    if pages.strip().lower() == "all":
+        return None
+
+    page_numbers: List[int] = []
+    for part in pages.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        try:
+            first, last = int(start), int(end if sep else start)
+        except ValueError:
+            raise ValueError(f"invalid page range {part!r}")
+        if first < 1 or last < first:
+            raise ValueError(f"invalid page range {part!r}")
+        page_numbers.extend(range(first, last + 1))
+    if not page_numbers:
+        raise ValueError(f"no pages in {pages!r}")
+    return page_numbers
 
 
-def extract_tables(pdf_path: Path, pages: str) -> List[pd.DataFrame]:
-    print(f"Reading tables from {pdf_path} (pages={pages})")
+def expand_pages(pdf_path: Path, pages: str) -> List[int]:
+    """
+    Page numbers for a page spec; "all" needs pdfplumber to count the pages.
+    """
+    page_numbers = parse_page_spec(pages)
+    if page_numbers is None:
+        return list(range(1, count_pdf_pages(pdf_path) + 1))
+    return page_numbers
+
+
+def chunk_pages(page_numbers: List[int], workers: int) -> List[List[int]]:
+    """
+    Split pages into at most `workers` contiguous chunks, keeping page order.
+    """
+    size = math.ceil(len(page_numbers) / workers)
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+
+def tabula_java_options(heap_mb: int = TABULA_HEAP_MB) -> List[str]:
+    return [f"-Xmx{heap_mb}m", "-XX:+UseG1GC", "-Dfile.encoding=UTF-8"]
+
+
+def read_tables_tabula(
+    pdf_path: str,
+    pages: Union[str, List[int]],
+    area: Optional[List[float]] = None,
+    columns: Optional[List[float]] = None,
+    heap_mb: int = TABULA_HEAP_MB,
+) -> List[PageTable]:
+    """
+    One tabula pass over the pages. tabula doesn't report which page a table
+    came from, so the page is None.
+    """
+    import tabula
+
+    layout: Dict[str, Any] = {}
+    if area:
+        layout["area"] = area
+    if columns:
+        layout["columns"] = columns
+
     tables = tabula.read_pdf(
-        str(pdf_path),
+        pdf_path,
         pages=pages,
         multiple_tables=True,
         lattice=False,   # turn OFF lattice
         stream=True,     # turn ON stream mode
-        guess=True,
+        guess=not layout,  # a pinned layout makes the detection pass redundant
+        java_options=tabula_java_options(heap_mb),
+        **layout,
     )
-    print(f"Found {len(tables)} raw tables")
+    return [(None, df) for df in tables]
+
+
+def read_tables_template(pdf_path: str, template_path: str) -> List[PageTable]:
+    """
+    One tabula pass driven by a Tabula-UI template. The template fixes the
+    pages, areas and extraction method, so no detection runs at all.
+    """
+    import tabula
+
+    tables = tabula.read_pdf_with_template(
+        pdf_path,
+        template_path,
+        java_options=tabula_java_options(),
+    )
+    return [(None, df) for df in tables]
+
+
+def read_tables_pdfplumber(
+    pdf_path: str,
+    page_numbers: List[int],
+    area: Optional[List[float]] = None,
+    columns: Optional[List[float]] = None,
+) -> List[PageTable]:
+    """
+    Extract tables in-process with pdfplumber, keeping each table's page number.
+    Row 0 of each DataFrame is the table's header row.
+    """
+    import pandas as pd
+    import pdfplumber
+
+    settings = dict(PDFPLUMBER_TABLE_SETTINGS)
+    if columns:
+        settings["vertical_strategy"] = "explicit"
+
+    tables: List[PageTable] = []
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        for page_num in page_numbers:
+            if not 1 <= page_num <= page_count:
+                raise ValueError(
+                    f"Page {page_num} is out of range: {pdf_path} has {page_count} pages"
+                )
+            page = pdf.pages[page_num - 1]
+            if area:
+                top, left, bottom, right = area
+                page_left, page_top, page_right, page_bottom = page.bbox
+                if left < page_left or top < page_top or right > page_right or bottom > page_bottom:
+                    raise ValueError(
+                        f"--area {','.join(f'{v:g}' for v in area)} is outside page "
+                        f"{page_num} ({page.width:g}x{page.height:g} pt)"
+                    )
+                page = page.crop((left, top, right, bottom))
+            if columns:
+                # --columns are Tabula-style dividers between columns, but
+                # pdfplumber only keeps cells between two lines. The outer
+                # lines have to sit at the text extent: the "text" row edges
+                # only span the words, so lines at the page edge never meet them.
+                words = page.extract_words()
+                if not words:
+                    continue
+                text_left = min(w["x0"] for w in words)
+                text_right = max(w["x1"] for w in words)
+                settings["explicit_vertical_lines"] = [text_left, *columns, text_right]
+            for raw in page.extract_tables(settings):
+                tables.append((page_num, pd.DataFrame(raw)))
+    return tables
+
+
+# Module-level so the readers can be sent to worker processes
+TABLE_READERS = {
+    "pdfplumber": read_tables_pdfplumber,
+    "tabula": read_tables_tabula,
+}
+
+
+def read_tables(
+    pdf_path: Path,
+    pages: str,
+    backend: str,
+    workers: int,
+    area: Optional[List[float]] = None,
+    columns: Optional[List[float]] = None,
+    template: Optional[Path] = None,
+) -> List[PageTable]:
+    """
+    Read tables with `backend`, splitting the pages over `workers` processes.
+    Results are concatenated in page order so table indices stay the same as
+    a single serial pass. A template already lists its pages, so it runs as
+    one tabula call.
+    """
+    if template is not None:
+        return read_tables_template(str(pdf_path), str(template))
+
+    reader = TABLE_READERS[backend]
+    if backend == "tabula" and workers <= 1:
+        # tabula takes the page spec as-is; no need to open the PDF first
+        return reader(str(pdf_path), pages, area, columns)
+
+    try:
+        page_numbers = expand_pages(pdf_path, pages)
+    except ImportError:
+        if backend != "tabula":
+            raise
+        print("pdfplumber is not installed, so pages can't be counted; using one tabula process")
+        return reader(str(pdf_path), pages, area, columns)
+    if backend == "tabula":
+        # One JVM per chunk: cap the count so the heap budget holds
+        workers = min(workers, TABULA_HEAP_MB // TABULA_MIN_HEAP_MB)
+    if workers <= 1 or len(page_numbers) < 2:
+        return reader(str(pdf_path), page_numbers, area, columns)
+
+    chunks = chunk_pages(page_numbers, workers)
+    if backend == "tabula":
+        reader = partial(read_tables_tabula, heap_mb=TABULA_HEAP_MB // len(chunks))
+    print(f"Parsing {len(page_numbers)} pages in {len(chunks)} {backend} processes")
+    tables: List[PageTable] = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [pool.submit(reader, str(pdf_path), chunk, area, columns) for chunk in chunks]
+        for future in futures:
+            tables.extend(future.result())
     return tables
 
 
+def extract_tables(
+    pdf_path: Path,
+    pages: str,
+    backend: str = "pdfplumber",
+    use_cache: bool = True,
+    workers: int = 1,
+    area: Optional[List[float]] = None,
+    columns: Optional[List[float]] = None,
+    template: Optional[Path] = None,
+) -> List[PageTable]:
+    cache_path = table_cache_path(pdf_path, pages, backend, area, columns, template)
+    if use_cache and cache_path.exists():
+        with open(cache_path, "rb") as f:
+            tables = pickle.load(f)
+        print(f"Loaded {len(tables)} raw tables from cache {cache_path}")
+        return tables
+
+    print(f"Reading tables from {pdf_path} (pages={pages}, backend={backend})")
+    tables = read_tables(pdf_path, pages, backend, workers, area, columns, template)
+    print(f"Found {len(tables)} raw tables")
+
+    if use_cache:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump(tables, f)
+    return tables
+
 
 def main():
     args = parse_args()
@@ -260,41 +680,65 @@ def main():
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-    tables = extract_tables(pdf_path, args.pages)
-    all_rows: List[Dict[str, Any]] = []
-
-    for idx, df in enumerate(tables):
-        if df is None or df.empty:
-            continue
-
-        if not looks_like_pipe_table(df):
-            continue
-
-        print(f"Processing table #{idx} that looks like a pipe table...")
-        rows = parse_pipe_rows(df)
-
-        # Add table/page metadata (page info isn't directly exposed here, so we leave page=None)
-        for r in rows:
-            r["b3610_table"] = f"Table_{idx}"
-            # If you know the page range, you can map idx → page manually later.
-            r["b3610_page"] = None
-
-        print(f"  → extracted {len(rows)} rows from table #{idx}")
-        all_rows.extend(rows)
+    template_path = Path(args.template) if args.template else None
+    if template_path is not None and not template_path.exists():
+        raise FileNotFoundError(f"Template not found: {template_path}")
+
+    layout = TABLE_LAYOUTS.get(pdf_path.name, {})
+    tables = extract_tables(
+        pdf_path,
+        args.pages,
+        backend="tabula" if template_path else args.backend,
+        use_cache=not args.no_cache,
+        workers=args.workers,
+        area=args.area or layout.get("area"),
+        columns=args.columns or layout.get("columns"),
+        template=template_path,
+    )
 
-    if not all_rows:
+    # Rows are streamed to a .partial file (renamed at the end) so an existing
+    # output isn't clobbered when nothing is extracted.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(output_path.name + ".partial")
+    seen_keys: Set[Tuple[Any, ...]] = set()
+
+    try:
+        with open(partial_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+
+            for idx, (page_num, df) in enumerate(tables):
+                if not looks_like_pipe_table(df):
+                    continue
+
+                print(f"Processing table #{idx} that looks like a pipe table...")
+                extracted = 0
+                for r in parse_pipe_rows(df):
+                    extracted += 1
+                    key = DEDUP_KEY(r)
+                    if key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+
+                    # Add table/page metadata
+                    r["b3610_table"] = f"Table_{idx}"
+                    # Only the pdfplumber backend knows the page; tabula leaves it None.
+                    r["b3610_page"] = page_num
+                    writer.writerow(r)
+
+                print(f"  → extracted {extracted} rows from table #{idx}")
+    except BaseException:
+        # Don't leave a stale .partial next to the real output
+        partial_path.unlink(missing_ok=True)
+        raise
+
+    if not seen_keys:
+        partial_path.unlink()
         print("WARNING: no pipe rows extracted. You may need to adjust pages or parsing logic.")
         return
 
-    # Deduplicate (optional) by (nps_inch, schedule, wall_thickness_inch)
-    df_out = pd.DataFrame(all_rows)
-    df_out = df_out.drop_duplicates(
-        subset=["nps_inch", "schedule", "wall_thickness_inch"]
-    ).reset_index(drop=True)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df_out.to_csv(output_path, index=False)
-    print(f"Saved {len(df_out)} rows to {output_path}")
+    partial_path.replace(output_path)
+    print(f"Saved {len(seen_keys)} rows to {output_path}")
 
 
 if __name__ == "__main__":